@@ -16,6 +16,7 @@ from src.common.utils import greenify, log_verbose
 from src.common.validators import validate_eth_address, validate_mnemonic
 from src.common.vault_config import VaultConfig
 from src.config.settings import AVAILABLE_NETWORKS, DEFAULT_NETWORK, settings
+from src.validators.keystores_cache import KeystoresCache
 
 
 @click.command(help='Recover vault data directory and keystores.')
@@ -162,6 +163,7 @@ async def main(
             )
         for file in keystores_dir.glob('*'):
             file.unlink()
+        KeystoresCache(settings.keystores_cache_file).remove()
     else:
         keystores_dir.mkdir(parents=True)
 
@@ -19,6 +19,7 @@ from src.common.utils import log_verbose
 from src.common.validators import validate_eth_address
 from src.common.vault_config import VaultConfig
 from src.config.settings import REMOTE_SIGNER_TIMEOUT, settings
+from src.validators.keystores_cache import KeystoresCache
 from src.validators.signing.key_shares import private_key_to_private_key_shares
 from src.validators.signing.remote import RemoteSignerConfiguration
 from src.validators.utils import load_keystores
@@ -197,6 +198,7 @@ async def main(remove_existing_keys: bool) -> None:
     # needed locally anymore
     for keystore_file in os.listdir(settings.keystores_dir):
         os.remove(settings.keystores_dir / keystore_file)
+    KeystoresCache(settings.keystores_cache_file).remove()
 
     click.echo('Removed keystores from local filesystem.')
 
@@ -33,7 +33,11 @@ from src.validators.signing.hashi_vault import (
 from src.validators.signing.remote import RemoteSignerConfiguration
 from src.validators.tasks import ValidatorsTask, load_genesis_validators
 from src.validators.typings import Keystores
-from src.validators.utils import load_deposit_data, load_keystores
+from src.validators.utils import (
+    close_oracles_session,
+    load_deposit_data,
+    load_keystores,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -271,12 +275,17 @@ async def main() -> None:
         logger.info('Using hashi vault at %s for loading public keys')
         keystores = await load_hashi_vault_keys(hashi_vault_config)
     else:
-        keystores = load_keystores()
+        keystores = load_keystores(use_cache=settings.enable_keystores_cache)
         if not keystores:
             raise RuntimeError('No keystores, no remote signer or hashi vault URL provided')
 
     # load deposit data
-    deposit_data = load_deposit_data(settings.vault, settings.deposit_data_file)
+    deposit_data = load_deposit_data(
+        settings.vault,
+        settings.deposit_data_file,
+        settings.pool_size,
+        settings.validators_tree_cache_file,
+    )
     logger.info('Loaded deposit data file %s', settings.deposit_data_file)
     # start operator tasks
 
@@ -309,7 +318,10 @@ async def main() -> None:
         if settings.harvest_vault:
             tasks.append(HarvestTask().run(interrupt_handler))
 
-        await asyncio.gather(*tasks)
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            await close_oracles_session()
 
 
 def log_start() -> None:
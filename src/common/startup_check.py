@@ -161,7 +161,12 @@ async def wait_for_deposit_data_file() -> None:
     while not path.exists(settings.deposit_data_file):
         logger.warning("Can't find deposit data file (%s)", settings.deposit_data_file)
         time.sleep(15)
-    deposit_data = load_deposit_data(settings.vault, settings.deposit_data_file)
+    deposit_data = load_deposit_data(
+        settings.vault,
+        settings.deposit_data_file,
+        settings.pool_size,
+        settings.validators_tree_cache_file,
+    )
 
     while True:
         try:
@@ -45,6 +45,9 @@ class Settings(metaclass=Singleton):
     keystores_dir: Path
     keystores_password_dir: Path
     keystores_password_file: Path
+    keystores_cache_file: Path
+    validators_tree_cache_file: Path
+    enable_keystores_cache: bool
     remote_signer_config_file: Path
     remote_signer_url: str | None
     hashi_vault_key_path: str | None
@@ -61,6 +64,7 @@ class Settings(metaclass=Singleton):
     validators_fetch_chunk_size: int
     sentry_dsn: str
     pool_size: int | None
+    disable_keystores_pool: bool
 
     # pylint: disable-next=too-many-arguments,too-many-locals
     def set(
@@ -105,6 +109,7 @@ class Settings(metaclass=Singleton):
         self.deposit_data_file = (
             Path(deposit_data_file) if deposit_data_file else vault_dir / 'deposit_data.json'
         )
+        self.validators_tree_cache_file = vault_dir / 'validators_tree_cache.json'
 
         # keystores
         self.keystores_dir = Path(keystores_dir) if keystores_dir else vault_dir / 'keystores'
@@ -118,6 +123,10 @@ class Settings(metaclass=Singleton):
             if keystores_password_file
             else vault_dir / 'keystores' / 'password.txt'
         )
+        self.keystores_cache_file = vault_dir / 'keystores_cache.json'
+        self.enable_keystores_cache = decouple_config(
+            'ENABLE_KEYSTORES_CACHE', default=False, cast=bool
+        )
 
         # remote signer configuration
         self.remote_signer_config_file = (
@@ -162,6 +171,9 @@ class Settings(metaclass=Singleton):
         self.pool_size = decouple_config(
             'POOL_SIZE', default=None, cast=lambda x: int(x) if x else None
         )
+        self.disable_keystores_pool = decouple_config(
+            'DISABLE_KEYSTORES_POOL', default=False, cast=bool
+        )
         self.execution_timeout = decouple_config('EXECUTION_TIMEOUT', default=30, cast=int)
         self.execution_transaction_timeout = decouple_config(
             'EXECUTION_TRANSACTION_TIMEOUT', default=300, cast=int
@@ -194,6 +206,9 @@ OUTDATED_SIGNATURES_URL_PATH = '/signatures/{vault}'
 ORACLES_VALIDATORS_TIMEOUT: int = decouple_config(
     'ORACLES_VALIDATORS_TIMEOUT', default=10, cast=int
 )
+ORACLES_VALIDATORS_CONCURRENCY: int = decouple_config(
+    'ORACLES_VALIDATORS_CONCURRENCY', default=16, cast=int
+)
 
 # common
 DEPOSIT_AMOUNT = Web3.to_wei(32, 'ether')
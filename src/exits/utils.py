@@ -8,7 +8,6 @@ import aiohttp
 from aiohttp import ClientError
 from eth_typing import ChecksumAddress
 from sw_utils.decorators import retry_aiohttp_errors
-from web3 import Web3
 
 from src.common.typings import OracleApproval, Oracles, OraclesApproval
 from src.common.utils import format_error, process_oracles_approvals, warning_verbose
@@ -103,7 +102,7 @@ async def send_signature_rotation_request(
 
     return OracleApproval(
         ipfs_hash=data['ipfs_hash'],
-        signature=Web3.to_bytes(hexstr=data['signature']),
+        signature=bytes.fromhex(data['signature'].removeprefix('0x')),
         deadline=data['deadline'],
     )
 
@@ -4,6 +4,7 @@ from pathlib import Path
 
 import click
 import milagro_bls_binding as bls
+import orjson
 import yaml
 from Cryptodome.Cipher import AES
 from Cryptodome.Random import get_random_bytes
@@ -70,10 +71,12 @@ async def upload_keypairs(db_url: str, b64_encrypt_key: str) -> None:
     encryption_key = _check_encryption_key(db_url, b64_encrypt_key)
 
     # load and check deposit data file
-    with open(settings.deposit_data_file, 'r', encoding='utf-8') as f:
-        deposit_data: list[dict] = json.load(f)
+    with open(settings.deposit_data_file, 'rb') as f:
+        deposit_data: list[dict] = orjson.loads(f.read())
 
-    deposit_data_tree, _ = generate_validators_tree(settings.vault, deposit_data)
+    deposit_data_tree, _ = generate_validators_tree(
+        settings.vault, deposit_data, settings.pool_size
+    )
     await check_deposit_data_root(deposit_data_tree.root)
 
     click.echo(f'Loading keystores from {settings.keystores_dir}...')
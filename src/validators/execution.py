@@ -1,6 +1,5 @@
 import logging
 import struct
-from typing import Set
 
 from eth_typing import BlockNumber, HexStr
 from multiproof.standard import MultiProof
@@ -86,7 +85,7 @@ def process_network_validator_event(event: EventData) -> HexStr | None:
     return None
 
 
-async def get_latest_network_validator_public_keys() -> Set[HexStr]:
+async def get_latest_network_validator_public_keys() -> list[HexStr]:
     """Fetches the latest network validator public keys."""
     last_validator = NetworkValidatorCrud().get_last_network_validator()
     if last_validator:
@@ -97,13 +96,9 @@ async def get_latest_network_validator_public_keys() -> Set[HexStr]:
     new_events = await validators_registry_contract.events.DepositEvent.get_logs(
         fromBlock=from_block
     )
-    new_public_keys: Set[HexStr] = set()
-    for event in new_events:
-        public_key = process_network_validator_event(event)
-        if public_key:
-            new_public_keys.add(public_key)
-
-    return new_public_keys
+    new_public_keys = (process_network_validator_event(event) for event in new_events)
+    # skip duplicates, keep events order
+    return list(dict.fromkeys(public_key for public_key in new_public_keys if public_key))
 
 
 async def get_withdrawable_assets() -> tuple[Wei, HexStr | None]:
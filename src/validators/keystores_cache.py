@@ -0,0 +1,129 @@
+import logging
+import os
+import secrets
+from pathlib import Path
+
+import orjson
+from Cryptodome.Cipher import AES
+from eth_typing import HexStr
+from web3 import Web3
+
+from src.common.utils import format_error
+from src.validators.typings import BLSPrivkey
+
+logger = logging.getLogger(__name__)
+
+KEY_LENGTH = 32
+
+
+class KeystoresCache:
+    """
+    Stores private keys of the decrypted keystores.
+    Private keys are encrypted with the random key stored in `key_file` next to the cache.
+    The keystore password is only used to detect password changes, it doesn't protect
+    the private keys: anyone who can read both files gets the private keys.
+    """
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = cache_file
+        self.key_file = cache_file.with_suffix('.key')
+        self.key: bytes | None = None
+        self.keystores: dict[str, dict] = {}
+        self._new_keystores: dict[str, dict] = {}
+        self._new_key = False
+
+    def load(self) -> None:
+        if not (self.cache_file.is_file() and self.key_file.is_file()):
+            return
+
+        try:
+            with open(self.key_file, 'rb') as f:
+                key = f.read()
+            with open(self.cache_file, 'rb') as f:
+                keystores = orjson.loads(f.read())['keystores']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(
+                'Failed to load keystores cache %s: %s', self.cache_file, format_error(e)
+            )
+            return
+
+        if len(key) != KEY_LENGTH:
+            logger.warning('Invalid keystores cache key %s', self.key_file)
+            return
+
+        self.key = key
+        self.keystores = keystores
+
+    def get(self, keystore_hash: str, password: str) -> tuple[HexStr, BLSPrivkey] | None:
+        """Returns cached keypair if keystore and its password haven't changed."""
+        entry = self.keystores.get(keystore_hash)
+        if entry is None or self.key is None:
+            return None
+
+        try:
+            cipher = AES.new(self.key, AES.MODE_GCM, nonce=_from_hex(entry['nonce']))
+            # the password is authenticated, but not used for encryption
+            cipher.update(password.encode('utf-8'))
+            private_key = cipher.decrypt_and_verify(
+                _from_hex(entry['private_key']), _from_hex(entry['tag'])
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # keystore password has changed or cache entry is corrupted
+            return None
+
+        self._new_keystores[keystore_hash] = entry
+        return entry['public_key'], BLSPrivkey(private_key)
+
+    def set(
+        self, keystore_hash: str, password: str, public_key: HexStr, private_key: BLSPrivkey
+    ) -> None:
+        if self.key is None:
+            self.key = secrets.token_bytes(KEY_LENGTH)
+            self._new_key = True
+
+        cipher = AES.new(self.key, AES.MODE_GCM)
+        cipher.update(password.encode('utf-8'))
+        encrypted_private_key, tag = cipher.encrypt_and_digest(private_key)
+        self._new_keystores[keystore_hash] = {
+            'public_key': public_key,
+            'nonce': Web3.to_hex(cipher.nonce),
+            'private_key': Web3.to_hex(encrypted_private_key),
+            'tag': Web3.to_hex(tag),
+        }
+
+    def save(self) -> None:
+        """Saves the keystores that were loaded or added, removed keystores are dropped."""
+        if self._new_keystores == self.keystores:
+            return
+
+        try:
+            if self._new_key and self.key is not None:
+                _write_private_file(self.key_file, self.key)
+                self._new_key = False
+            _write_private_file(self.cache_file, orjson.dumps({'keystores': self._new_keystores}))
+        except OSError as e:
+            logger.warning(
+                'Failed to save keystores cache %s: %s', self.cache_file, format_error(e)
+            )
+            return
+
+        self.keystores = dict(self._new_keystores)
+
+    def remove(self) -> None:
+        """Removes the cache and its key, e.g. when the local keystores are removed."""
+        self.cache_file.unlink(missing_ok=True)
+        self.key_file.unlink(missing_ok=True)
+
+
+def _from_hex(value: str) -> bytes:
+    return bytes.fromhex(value.removeprefix('0x'))
+
+
+def _write_private_file(path: Path, data: bytes) -> None:
+    # write to the temporary file first so that the file is never left half-written
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    tmp_path.unlink(missing_ok=True)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
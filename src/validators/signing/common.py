@@ -31,8 +31,9 @@ def get_validators_proof(
 
 
 def encode_tx_validator(withdrawal_credentials: bytes, validator: Validator) -> bytes:
-    public_key = Web3.to_bytes(hexstr=validator.public_key)
-    signature = Web3.to_bytes(hexstr=validator.signature)
+    # public key and signature are always hex strings, skip web3 type dispatch
+    public_key = bytes.fromhex(validator.public_key.removeprefix('0x'))
+    signature = bytes.fromhex(validator.signature.removeprefix('0x'))
     deposit_root = compute_deposit_data(
         public_key=public_key,
         withdrawal_credentials=withdrawal_credentials,
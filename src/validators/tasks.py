@@ -230,7 +230,7 @@ async def create_approval_request(
 
     # get next validator index for exit signature
     latest_public_keys = await get_latest_network_validator_public_keys()
-    validator_index = NetworkValidatorCrud().get_next_validator_index(list(latest_public_keys))
+    validator_index = NetworkValidatorCrud().get_next_validator_index(latest_public_keys)
     logger.debug('Next validator index for exit signature: %d', validator_index)
 
     # get exit signature shards
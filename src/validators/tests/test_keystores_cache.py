@@ -0,0 +1,74 @@
+from pathlib import Path
+from secrets import token_bytes
+from unittest import mock
+
+import pytest
+
+from src.config.settings import settings
+from src.validators.keystores_cache import KeystoresCache
+from src.validators.typings import BLSPrivkey
+from src.validators.utils import load_keystores
+
+
+class TestKeystoresCache:
+    def test_get(self, temp_dir: Path):
+        cache_file = temp_dir / 'keystores_cache.json'
+        private_key = BLSPrivkey(token_bytes(32))
+
+        keystores_cache = KeystoresCache(cache_file)
+        keystores_cache.load()
+        assert keystores_cache.get('hash', 'password') is None
+
+        keystores_cache.set('hash', 'password', '0x01', private_key)
+        keystores_cache.save()
+
+        keystores_cache = KeystoresCache(cache_file)
+        keystores_cache.load()
+        assert keystores_cache.get('hash', 'password') == ('0x01', private_key)
+        assert keystores_cache.get('hash', 'other_password') is None
+        assert keystores_cache.get('other_hash', 'password') is None
+
+    def test_save_removes_unused(self, temp_dir: Path):
+        cache_file = temp_dir / 'keystores_cache.json'
+        keystores_cache = KeystoresCache(cache_file)
+        keystores_cache.set('hash_1', 'password', '0x01', BLSPrivkey(token_bytes(32)))
+        keystores_cache.set('hash_2', 'password', '0x02', BLSPrivkey(token_bytes(32)))
+        keystores_cache.save()
+
+        keystores_cache = KeystoresCache(cache_file)
+        keystores_cache.load()
+        assert keystores_cache.get('hash_1', 'password') is not None
+        keystores_cache.save()
+
+        keystores_cache = KeystoresCache(cache_file)
+        keystores_cache.load()
+        assert keystores_cache.get('hash_2', 'password') is None
+
+    def test_remove(self, temp_dir: Path):
+        cache_file = temp_dir / 'keystores_cache.json'
+        keystores_cache = KeystoresCache(cache_file)
+        keystores_cache.set('hash', 'password', '0x01', BLSPrivkey(token_bytes(32)))
+        keystores_cache.save()
+        assert cache_file.stat().st_mode & 0o777 == 0o600
+        assert keystores_cache.key_file.stat().st_mode & 0o777 == 0o600
+
+        keystores_cache.remove()
+        assert not cache_file.exists()
+        assert not keystores_cache.key_file.exists()
+
+
+@pytest.mark.usefixtures('_init_vault', '_create_keys', 'fake_settings')
+class TestLoadKeystoresCache:
+    def test_warm_start(self):
+        keystores = load_keystores(use_cache=True)
+        assert len(keystores) == 3
+        assert settings.keystores_cache_file.is_file()
+
+        with mock.patch('src.validators.utils._decrypt_keystores') as decrypt_mock:
+            cached_keystores = load_keystores(use_cache=True)
+        decrypt_mock.assert_not_called()
+        assert cached_keystores == keystores
+
+    def test_cache_disabled(self):
+        load_keystores()
+        assert not settings.keystores_cache_file.exists()
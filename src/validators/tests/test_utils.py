@@ -0,0 +1,277 @@
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+from secrets import token_bytes, token_hex
+from typing import Generator
+from unittest import mock
+
+import milagro_bls_binding as bls
+import pytest
+from aiohttp import ClientError
+from eth_typing import HexAddress
+from staking_deposit.key_handling.keystore import ScryptKeystore
+
+from src.config.settings import ORACLES_VALIDATORS_TIMEOUT
+from src.validators import utils
+from src.validators.exceptions import KeystoreException
+from src.validators.typings import KeystoreFile
+from src.validators.utils import (
+    REGISTRY_STATE_TTL,
+    _encode_leaf,
+    _get_registry_state,
+    _process_keystore_files,
+    _update_endpoint_latency,
+    generate_validators_tree,
+    load_deposit_data,
+    send_approval_request_to_replicas,
+    send_approval_requests,
+)
+
+
+@pytest.fixture
+def deposit_data() -> list[dict]:
+    return [{'pubkey': token_hex(48), 'signature': token_hex(96)} for _ in range(5)]
+
+
+@pytest.fixture
+def deposit_data_file(temp_dir: Path, deposit_data: list[dict]) -> Path:
+    deposit_data_file = temp_dir / 'deposit_data.json'
+    with open(deposit_data_file, 'w', encoding='utf-8') as f:
+        json.dump(deposit_data, f)
+    return deposit_data_file
+
+
+@pytest.fixture
+def cache_file(temp_dir: Path) -> Path:
+    return temp_dir / 'validators_tree_cache.json'
+
+
+class TestLoadDepositData:
+    def test_tree_cache(
+        self,
+        vault_address: HexAddress,
+        deposit_data: list[dict],
+        deposit_data_file: Path,
+        cache_file: Path,
+    ):
+        tree, validators = generate_validators_tree(vault_address, deposit_data, pool_size=1)
+
+        result = load_deposit_data(vault_address, deposit_data_file, 1, cache_file)
+        assert result.tree.root == tree.root
+        assert result.validators == validators
+        assert cache_file.is_file()
+
+        with mock.patch('src.validators.utils.generate_validators_tree') as generate_mock:
+            result = load_deposit_data(vault_address, deposit_data_file, 1, cache_file)
+        generate_mock.assert_not_called()
+        assert result.tree.root == tree.root
+        assert result.validators == validators
+
+    def test_tree_cache_invalidated(
+        self,
+        vault_address: HexAddress,
+        deposit_data: list[dict],
+        deposit_data_file: Path,
+        cache_file: Path,
+    ):
+        load_deposit_data(vault_address, deposit_data_file, 1, cache_file)
+
+        deposit_data = deposit_data[:3]
+        with open(deposit_data_file, 'w', encoding='utf-8') as f:
+            json.dump(deposit_data, f)
+
+        tree, _ = generate_validators_tree(vault_address, deposit_data, pool_size=1)
+        result = load_deposit_data(vault_address, deposit_data_file, 1, cache_file)
+        assert result.tree.root == tree.root
+        assert len(result.validators) == 3
+
+    def test_tree_cache_reused_leaves(
+        self,
+        vault_address: HexAddress,
+        deposit_data: list[dict],
+        deposit_data_file: Path,
+        cache_file: Path,
+    ):
+        load_deposit_data(vault_address, deposit_data_file, 1, cache_file)
+
+        deposit_data.append({'pubkey': token_hex(48), 'signature': token_hex(96)})
+        with open(deposit_data_file, 'w', encoding='utf-8') as f:
+            json.dump(deposit_data, f)
+
+        tree, validators = generate_validators_tree(vault_address, deposit_data, pool_size=1)
+        with mock.patch('src.validators.utils._encode_leaf', wraps=_encode_leaf) as encode_mock:
+            result = load_deposit_data(vault_address, deposit_data_file, 1, cache_file)
+        encode_mock.assert_called_once_with(mock.ANY, validators[-1])
+        assert result.tree.root == tree.root
+        assert result.validators == validators
+
+    def test_tree_cache_corrupted(
+        self,
+        vault_address: HexAddress,
+        deposit_data: list[dict],
+        deposit_data_file: Path,
+        cache_file: Path,
+    ):
+        load_deposit_data(vault_address, deposit_data_file, 1, cache_file)
+
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        cache['tree'][0] = '0x' + token_hex(32)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+
+        tree, _ = generate_validators_tree(vault_address, deposit_data, pool_size=1)
+        result = load_deposit_data(vault_address, deposit_data_file, 1, cache_file)
+        assert result.tree.root == tree.root
+
+
+@pytest.fixture
+def endpoint_latencies() -> Generator[dict[str, float], None, None]:
+    with mock.patch.dict('src.validators.utils._endpoint_latencies', clear=True) as latencies:
+        yield latencies
+
+
+class TestSendApprovalRequestToReplicas:
+    def test_update_endpoint_latency(self, endpoint_latencies: dict[str, float]):
+        _update_endpoint_latency('http://oracle', 1.0)
+        assert endpoint_latencies['http://oracle'] == 1.0
+
+        _update_endpoint_latency('http://oracle', 2.0)
+        assert endpoint_latencies['http://oracle'] == pytest.approx(1.2)
+
+    async def test_replicas_order(self, endpoint_latencies: dict[str, float]):
+        endpoint_latencies.update({'http://slow': 0.5, 'http://fast': 0.1})
+        approval = mock.Mock()
+
+        async def send_approval_request(session, endpoint, request, payload):
+            if endpoint == 'http://new':
+                raise ClientError()
+            return approval
+
+        with mock.patch('random.uniform', return_value=0.0), mock.patch(
+            'src.validators.utils.send_approval_request', side_effect=send_approval_request
+        ) as send_mock:
+            result = await send_approval_request_to_replicas(
+                session=mock.Mock(),
+                replicas=['http://slow', 'http://fast', 'http://new'],
+                request=mock.Mock(),
+                payload=b'{}',
+            )
+
+        assert result is approval
+        # unknown endpoints are tried first, then the fastest ones
+        assert [call.args[1] for call in send_mock.call_args_list] == [
+            'http://new',
+            'http://fast',
+        ]
+        # failed endpoints are counted as timed out
+        assert endpoint_latencies['http://new'] == ORACLES_VALIDATORS_TIMEOUT
+        assert endpoint_latencies['http://slow'] == 0.5
+
+
+def _create_keystore(
+    keystores_dir: Path, name: str, secret: bytes, password: str, salt: bytes
+) -> None:
+    keystore = ScryptKeystore.encrypt(
+        secret=secret, password=password, kdf_salt=salt, aes_iv=token_bytes(16)
+    )
+    keystore.save(str(keystores_dir / name))
+
+
+@pytest.mark.usefixtures('fake_settings', 'mock_scrypt_keystore')
+class TestProcessKeystoreFiles:
+    def test_shared_decryption_key(self, keystores_dir: Path):
+        salt = token_bytes(32)
+        secrets = [i.to_bytes(32, 'big') for i in range(1, 4)]
+        _create_keystore(keystores_dir, 'keystore-0.json', secrets[0], 'password', salt)
+        _create_keystore(keystores_dir, 'keystore-1.json', secrets[1], 'password', token_bytes(32))
+        _create_keystore(keystores_dir, 'keystore-2.json', secrets[2], 'password', salt)
+        keystore_files = [
+            KeystoreFile(name=f'keystore-{i}.json', password='password') for i in range(3)
+        ]
+
+        with mock.patch('hashlib.scrypt', wraps=hashlib.scrypt) as scrypt_mock:
+            results = _process_keystore_files(keystore_files, keystores_dir)
+
+        # keystores with the same salt are decrypted with one derived key
+        assert scrypt_mock.call_count == 2
+        assert results == [('0x' + bls.SkToPk(secret).hex(), secret) for secret in secrets]
+
+    def test_invalid_password_in_group(self, keystores_dir: Path):
+        salt = token_bytes(32)
+        _create_keystore(
+            keystores_dir, 'keystore-0.json', (1).to_bytes(32, 'big'), 'password', salt
+        )
+        _create_keystore(keystores_dir, 'keystore-1.json', (2).to_bytes(32, 'big'), 'other', salt)
+        keystore_files = [
+            KeystoreFile(name=f'keystore-{i}.json', password='password') for i in range(2)
+        ]
+
+        with pytest.raises(KeystoreException, match='keystore-1.json'):
+            _process_keystore_files(keystore_files, keystores_dir)
+
+
+@pytest.fixture
+def _reset_registry_state() -> Generator:
+    with mock.patch('src.validators.utils._registry_state', None):
+        yield
+
+
+@pytest.mark.usefixtures('_reset_registry_state')
+class TestGetRegistryState:
+    async def test_shared_between_requests(self):
+        async def fetch_registry_state():
+            await asyncio.sleep(0.01)
+            return '0x01', 1
+
+        with mock.patch(
+            'src.validators.utils._fetch_registry_state', side_effect=fetch_registry_state
+        ) as fetch_mock:
+            results = await asyncio.gather(*[_get_registry_state() for _ in range(3)])
+
+        fetch_mock.assert_called_once()
+        assert results == [('0x01', 1)] * 3
+
+    async def test_failed_fetch_not_reused(self):
+        with mock.patch(
+            'src.validators.utils._fetch_registry_state',
+            side_effect=[RuntimeError('failed'), ('0x01', 1)],
+        ) as fetch_mock:
+            with pytest.raises(RuntimeError):
+                await _get_registry_state()
+            assert await _get_registry_state() == ('0x01', 1)
+
+        assert fetch_mock.call_count == 2
+
+    async def test_expired(self):
+        with mock.patch(
+            'src.validators.utils._fetch_registry_state', side_effect=[('0x01', 1), ('0x02', 2)]
+        ) as fetch_mock:
+            assert await _get_registry_state() == ('0x01', 1)
+            assert await _get_registry_state() == ('0x01', 1)
+
+            fetched_at, task = utils._registry_state  # type: ignore
+            utils._registry_state = fetched_at - REGISTRY_STATE_TTL - 1, task
+            assert await _get_registry_state() == ('0x02', 2)
+
+        assert fetch_mock.call_count == 2
+
+    async def test_reset_by_approval_requests(self):
+        utils._registry_state = mock.Mock()
+        registry_states = []
+
+        async def send_approval_request_to_replicas(**kwargs):
+            registry_states.append(utils._registry_state)
+            return mock.Mock()
+
+        oracles = mock.Mock(
+            addresses=['0x01'], endpoints=[['http://oracle']], validators_threshold=1
+        )
+        with mock.patch('src.validators.utils.get_oracles_session'), mock.patch(
+            'src.validators.utils.send_approval_request_to_replicas',
+            side_effect=send_approval_request_to_replicas,
+        ), mock.patch('src.validators.utils.process_oracles_approvals'):
+            await send_approval_requests(oracles, mock.Mock(deadline=0, validator_index=0))
+
+        assert registry_states == [None]
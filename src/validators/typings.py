@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import NewType
 
 from eth_typing import BlockNumber, ChecksumAddress, HexStr
@@ -49,6 +49,10 @@ class ApprovalRequest:
     proof_flags: list[bool]
     proof_indexes: list[int]
 
+    def to_dict(self) -> dict:
+        """Same as `dataclasses.asdict`, but without deep copying the fields."""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
 
 @dataclass
 class KeeperApprovalParams:
@@ -1,19 +1,22 @@
 import asyncio
-import dataclasses
-import json
+import hashlib
 import logging
+import os
 import random
-from multiprocessing import Pool
-from os import listdir
-from os.path import isfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool, cpu_count
 from pathlib import Path
 
 import milagro_bls_binding as bls
-from aiohttp import ClientError, ClientSession, ClientTimeout
+import orjson
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
 from eth_typing import ChecksumAddress, HexAddress, HexStr
 from eth_utils import add_0x_prefix
 from multiproof import StandardMerkleTree
-from staking_deposit.key_handling.keystore import ScryptKeystore
+from multiproof.standard import LeafValue, StandardMerkleTreeData
+from staking_deposit.key_handling.keystore import Keystore, ScryptKeystore
+from staking_deposit.utils.crypto import AES_128_CTR, SHA256
 from sw_utils import get_eth1_withdrawal_credentials
 from sw_utils.decorators import retry_aiohttp_errors
 from web3 import Web3
@@ -21,7 +24,12 @@ from web3 import Web3
 from src.common.contracts import validators_registry_contract
 from src.common.typings import OracleApproval, Oracles, OraclesApproval
 from src.common.utils import format_error, process_oracles_approvals, warning_verbose
-from src.config.settings import DEFAULT_RETRY_TIME, ORACLES_VALIDATORS_TIMEOUT, settings
+from src.config.settings import (
+    DEFAULT_RETRY_TIME,
+    ORACLES_VALIDATORS_CONCURRENCY,
+    ORACLES_VALIDATORS_TIMEOUT,
+    settings,
+)
 from src.validators.database import NetworkValidatorCrud
 from src.validators.exceptions import (
     KeystoreException,
@@ -29,6 +37,7 @@ from src.validators.exceptions import (
     ValidatorIndexChangedError,
 )
 from src.validators.execution import get_latest_network_validator_public_keys
+from src.validators.keystores_cache import KeystoresCache
 from src.validators.signing.common import encode_tx_validator
 from src.validators.typings import (
     ApprovalRequest,
@@ -41,22 +50,61 @@ from src.validators.typings import (
 
 logger = logging.getLogger(__name__)
 
+_oracles_session: ClientSession | None = None
+
+# oracle endpoint -> exponential moving average of the response time in seconds
+_endpoint_latencies: dict[str, float] = {}
+ENDPOINT_LATENCY_JITTER = 0.05
+
+# registry root and next validator index fetched after the failed approval request
+_registry_state: tuple[float, asyncio.Task] | None = None
+REGISTRY_STATE_TTL = 2.0
+
+# encoding fewer leaves is faster than starting the worker processes
+VALIDATORS_TREE_POOL_THRESHOLD = 100
+
+
+async def get_oracles_session() -> ClientSession:
+    """Returns long-lived session to keep connections to the oracles alive between requests."""
+    global _oracles_session  # pylint: disable=global-statement
+    if _oracles_session is None or _oracles_session.closed:
+        _oracles_session = ClientSession(
+            timeout=ClientTimeout(ORACLES_VALIDATORS_TIMEOUT),
+            connector=TCPConnector(limit=64, limit_per_host=8, keepalive_timeout=75),
+        )
+    return _oracles_session
+
+
+async def close_oracles_session() -> None:
+    global _oracles_session  # pylint: disable=global-statement
+    if _oracles_session is not None:
+        await _oracles_session.close()
+        _oracles_session = None
+
 
 async def send_approval_requests(oracles: Oracles, request: ApprovalRequest) -> OraclesApproval:
     """Requests approval from all oracles."""
-    payload = dataclasses.asdict(request)
+    global _registry_state  # pylint: disable=global-statement
+    _registry_state = None
+
+    # serialize once instead of for every oracle endpoint
+    payload = orjson.dumps(request.to_dict())
     endpoints = list(zip(oracles.addresses, oracles.endpoints))
 
-    async with ClientSession(timeout=ClientTimeout(ORACLES_VALIDATORS_TIMEOUT)) as session:
-        results = await asyncio.gather(
-            *[
-                send_approval_request_to_replicas(
-                    session=session, replicas=replicas, payload=payload
-                )
-                for address, replicas in endpoints
-            ],
-            return_exceptions=True,
-        )
+    session = await get_oracles_session()
+    # limit number of oracles requested at once to avoid exhausting connections pool
+    semaphore = asyncio.Semaphore(ORACLES_VALIDATORS_CONCURRENCY)
+
+    async def _send_approval_request_to_replicas(replicas: list[str]) -> OracleApproval:
+        async with semaphore:
+            return await send_approval_request_to_replicas(
+                session=session, replicas=replicas, request=request, payload=payload
+            )
+
+    results = await asyncio.gather(
+        *[_send_approval_request_to_replicas(replicas) for address, replicas in endpoints],
+        return_exceptions=True,
+    )
 
     approvals: dict[ChecksumAddress, OracleApproval] = {}
     failed_endpoints: list[str] = []
@@ -94,19 +142,30 @@ async def send_approval_requests(oracles: Oracles, request: ApprovalRequest) ->
 # pylint: disable=duplicate-code
 @retry_aiohttp_errors(delay=DEFAULT_RETRY_TIME)
 async def send_approval_request_to_replicas(
-    session: ClientSession, replicas: list[str], payload: dict
+    session: ClientSession, replicas: list[str], request: ApprovalRequest, payload: bytes
 ) -> OracleApproval:
     last_error = None
 
-    # Shuffling may help if the first endpoint is slower than others
-    replicas = random.sample(replicas, len(replicas))
+    # Try the fastest endpoints first, jitter spreads the load between similar endpoints
+    replicas = sorted(
+        replicas,
+        key=lambda endpoint: _endpoint_latencies.get(endpoint, 0.0)
+        + random.uniform(0, ENDPOINT_LATENCY_JITTER),  # nosec
+    )
 
     for endpoint in replicas:
+        start_time = time.monotonic()
         try:
-            return await send_approval_request(session, endpoint, payload)
+            approval = await send_approval_request(session, endpoint, request, payload)
         except (ClientError, asyncio.TimeoutError) as e:
             warning_verbose('%s for endpoint %s', format_error(e), endpoint)
             last_error = e
+            # failed endpoints are counted as timed out
+            _update_endpoint_latency(endpoint, ORACLES_VALIDATORS_TIMEOUT)
+            continue
+
+        _update_endpoint_latency(endpoint, time.monotonic() - start_time)
+        return approval
 
     if last_error:
         raise last_error
@@ -114,102 +173,285 @@ async def send_approval_request_to_replicas(
     raise RuntimeError('Failed to get response from replicas')
 
 
+def _update_endpoint_latency(endpoint: str, latency: float) -> None:
+    average_latency = _endpoint_latencies.get(endpoint)
+    if average_latency is None:
+        _endpoint_latencies[endpoint] = latency
+    else:
+        _endpoint_latencies[endpoint] = 0.8 * average_latency + 0.2 * latency
+
+
 async def send_approval_request(
-    session: ClientSession, endpoint: str, payload: dict
+    session: ClientSession, endpoint: str, request: ApprovalRequest, payload: bytes
 ) -> OracleApproval:
-    """Requests approval from single oracle."""
+    """Requests approval from single oracle. `payload` is the serialized `request`."""
     logger.debug('send_approval_request to %s', endpoint)
     try:
-        async with session.post(url=endpoint, json=payload) as response:
+        async with session.post(
+            url=endpoint, data=payload, headers={'Content-Type': 'application/json'}
+        ) as response:
             if response.status == 400:
-                logger.warning('%s response: %s', endpoint, await response.json())
+                logger.warning('%s response: %s', endpoint, await response.json(loads=orjson.loads))
             response.raise_for_status()
-            data = await response.json()
+            data = await response.json(loads=orjson.loads)
     except (ClientError, asyncio.TimeoutError) as e:
-        registry_root = await validators_registry_contract.get_registry_root()
-        if Web3.to_hex(registry_root) != payload['validators_root']:
+        registry_root, validator_index = await _get_registry_state()
+        if registry_root != request.validators_root:
             raise RegistryRootChangedError from e
 
-        latest_public_keys = await get_latest_network_validator_public_keys()
-        validator_index = NetworkValidatorCrud().get_next_validator_index(list(latest_public_keys))
-        if validator_index != payload['validator_index']:
+        if validator_index != request.validator_index:
             raise ValidatorIndexChangedError from e
 
         raise e
     logger.debug('Received response from oracle %s: %s', endpoint, response)
     return OracleApproval(
         ipfs_hash=data['ipfs_hash'],
-        signature=Web3.to_bytes(hexstr=data['signature']),
+        signature=bytes.fromhex(data['signature'].removeprefix('0x')),
         deadline=data['deadline'],
     )
 
 
+async def _get_registry_state() -> tuple[HexStr, int]:
+    """
+    Returns validators registry root and next validator index.
+    The result is shared between the failed requests of the same approval round.
+    """
+    global _registry_state  # pylint: disable=global-statement
+    now = time.monotonic()
+    if _registry_state is not None:
+        fetched_at, task = _registry_state
+        if now - fetched_at > REGISTRY_STATE_TTL or (
+            task.done() and (task.cancelled() or task.exception() is not None)
+        ):
+            _registry_state = None
+
+    if _registry_state is None:
+        _registry_state = now, asyncio.create_task(_fetch_registry_state())
+
+    # shield the task from cancellation as it is awaited by other requests
+    return await asyncio.shield(_registry_state[1])
+
+
+async def _fetch_registry_state() -> tuple[HexStr, int]:
+    registry_root = await validators_registry_contract.get_registry_root()
+    latest_public_keys = await get_latest_network_validator_public_keys()
+    validator_index = NetworkValidatorCrud().get_next_validator_index(latest_public_keys)
+    return Web3.to_hex(registry_root), validator_index
+
+
 def list_keystore_files() -> list[KeystoreFile]:
     keystores_dir = settings.keystores_dir
     keystores_password_dir = settings.keystores_password_dir
     keystores_password_file = settings.keystores_password_file
 
+    keystores_dir_files = _list_files(keystores_dir)
+    # check password files presence in memory instead of calling stat for every keystore
+    password_files: set[str] = set()
+    if keystores_password_dir == keystores_dir:
+        password_files = set(keystores_dir_files)
+    elif keystores_password_dir.is_dir():
+        password_files = set(_list_files(keystores_password_dir))
+
+    # the shared password file is read once
+    passwords: dict[Path, str] = {}
     res: list[KeystoreFile] = []
-    for f in listdir(keystores_dir):
-        if not (isfile(keystores_dir / f) and f.startswith('keystore') and f.endswith('.json')):
+    for f in keystores_dir_files:
+        if not (f.startswith('keystore') and f.endswith('.json')):
             continue
 
-        password_file = keystores_password_dir / f.replace('.json', '.txt')
-        if not isfile(password_file):
+        password_file_name = f.replace('.json', '.txt')
+        if password_file_name in password_files:
+            password_file = keystores_password_dir / password_file_name
+        else:
             password_file = keystores_password_file
 
-        password = _load_keystores_password(password_file)
+        password = passwords.get(password_file)
+        if password is None:
+            password = _load_keystores_password(password_file)
+            passwords[password_file] = password
         res.append(KeystoreFile(name=f, password=password))
 
     return res
 
 
-def load_keystores() -> Keystores:
-    """Extracts private keys from the keystores."""
+def _list_files(path: Path) -> list[str]:
+    # scandir entries come with the file type, no need for a separate stat call
+    with os.scandir(path) as entries:
+        return sorted(entry.name for entry in entries if entry.is_file())
+
+
+def load_keystores(use_cache: bool = False) -> Keystores:
+    """
+    Extracts private keys from the keystores.
+    With `use_cache` the decrypted keystores are stored in the keystores cache.
+    """
     keystore_files = list_keystore_files()
     logger.info('Loading keystores from %s...', settings.keystores_dir)
-    keystores = {}
-    with Pool(processes=settings.pool_size) as pool:
-        # pylint: disable-next=unused-argument
-        def _stop_pool(*args, **kwargs):
-            pool.close()
-
-        results = [
-            pool.apply_async(
-                _process_keystore_file,
-                (keystore_file, settings.keystores_dir),
-                error_callback=_stop_pool,
+
+    keystores: dict[HexStr, BLSPrivkey] = {}
+    keystores_cache: KeystoresCache | None = None
+    keystore_hashes: dict[str, str] = {}
+    new_keystore_files = keystore_files
+    if use_cache:
+        # skip decryption of the keystores that were decrypted before with the same password
+        keystores_cache = KeystoresCache(settings.keystores_cache_file)
+        keystores_cache.load()
+        new_keystore_files = []
+        for keystore_file in keystore_files:
+            keystore_hash = _get_keystore_hash(keystore_file, settings.keystores_dir)
+            keystore_hashes[keystore_file.name] = keystore_hash
+            keypair = keystores_cache.get(keystore_hash, keystore_file.password)
+            if keypair is None:
+                new_keystore_files.append(keystore_file)
+                continue
+            public_key, private_key = keypair
+            keystores[public_key] = private_key
+
+    try:
+        results = _process_keystore_files(new_keystore_files, settings.keystores_dir)
+    except KeystoreException as e:
+        logger.error(e)
+        raise RuntimeError('Failed to load keystores') from e
+
+    for keystore_file, (public_key, private_key) in zip(new_keystore_files, results):
+        keystores[public_key] = private_key
+        if keystores_cache is not None:
+            keystores_cache.set(
+                keystore_hashes[keystore_file.name],
+                keystore_file.password,
+                public_key,
+                private_key,
             )
-            for keystore_file in keystore_files
-        ]
-        for result in results:
-            result.wait()
-            try:
-                pub_key, priv_key = result.get()
-                keystores[pub_key] = priv_key
-            except KeystoreException as e:
-                logger.error(e)
-                raise RuntimeError('Failed to load keystores') from e
+
+    if keystores_cache is not None:
+        keystores_cache.save()
 
     logger.info('Loaded %d keystores', len(keystores))
     return Keystores(keystores)
 
 
-def load_deposit_data(vault: HexAddress, deposit_data_file: Path) -> DepositData:
-    """Loads and verifies deposit data."""
-    with open(deposit_data_file, 'r', encoding='utf-8') as f:
-        deposit_data = json.load(f)
-
-    tree, validators = generate_validators_tree(vault, deposit_data)
+def _process_keystore_files(
+    keystore_files: list[KeystoreFile], keystore_path: Path
+) -> list[tuple[HexStr, BLSPrivkey]]:
+    """
+    Decrypts the keystores. Keystores sharing the password and KDF params
+    are decrypted together, so that the decryption key is derived once.
+    """
+    groups: dict[tuple, list[int]] = {}
+    keystores: list[Keystore] = []
+    for index, keystore_file in enumerate(keystore_files):
+        keystore = _load_keystore(keystore_file, keystore_path)
+        keystores.append(keystore)
+        key_id = _get_decryption_key_id(keystore, keystore_file.password)
+        groups.setdefault(key_id, []).append(index)
+
+    keystore_groups = [
+        [(keystore_files[index], keystores[index]) for index in indexes]
+        for indexes in groups.values()
+    ]
+    if settings.disable_keystores_pool:
+        group_results = [_decrypt_keystores(keystore_group) for keystore_group in keystore_groups]
+    else:
+        group_results = _decrypt_keystores_in_pool(keystore_groups)
+
+    results: dict[int, tuple[HexStr, BLSPrivkey]] = {}
+    for indexes, group_result in zip(groups.values(), group_results):
+        results.update(zip(indexes, group_result))
+    return [results[index] for index in range(len(keystore_files))]
+
+
+def _decrypt_keystores_in_pool(
+    keystore_groups: list[list[tuple[KeystoreFile, Keystore]]],
+) -> list[list[tuple[HexStr, BLSPrivkey]]]:
+    # scrypt releases the GIL, so the keystores are decrypted in parallel by threads
+    with ThreadPoolExecutor(max_workers=settings.pool_size or cpu_count()) as executor:
+        results = executor.map(_decrypt_keystores, keystore_groups)
+        try:
+            return list(results)
+        except KeystoreException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def load_deposit_data(
+    vault: HexAddress,
+    deposit_data_file: Path,
+    pool_size: int | None = None,
+    cache_file: Path | None = None,
+) -> DepositData:
+    """
+    Loads and verifies deposit data.
+    The tree is stored in `cache_file` to skip rebuilding it on restart.
+    """
+    with open(deposit_data_file, 'rb') as f:
+        deposit_data_bytes = f.read()
+    deposit_data = orjson.loads(deposit_data_bytes)
+    if cache_file is None:
+        tree, validators = generate_validators_tree(vault, deposit_data, pool_size)
+        return DepositData(validators=validators, tree=tree)
+
+    deposit_data_hash = hashlib.sha256(deposit_data_bytes).hexdigest()
+    encoded_leaves: dict[str, bytes] = {}
+    cache = _read_validators_tree_cache(cache_file, vault)
+    if cache is not None:
+        cached_tree = _load_validators_tree_cache(cache_file, cache)
+        if cached_tree is not None:
+            if cache.get('deposit_data_hash') == deposit_data_hash:
+                return DepositData(validators=_get_validators(deposit_data), tree=cached_tree)
+
+            # deposit data has changed, encode only the leaves that are not in the cache
+            encoded_leaves = _get_cached_leaves(cached_tree)
+
+    tree, validators = generate_validators_tree(vault, deposit_data, pool_size, encoded_leaves)
+    _save_validators_tree_cache(cache_file, vault, deposit_data_hash, tree)
     return DepositData(validators=validators, tree=tree)
 
 
 def generate_validators_tree(
-    vault: HexAddress, deposit_data: list[dict]
+    vault: HexAddress,
+    deposit_data: list[dict],
+    pool_size: int | None = None,
+    encoded_leaves: dict[str, bytes] | None = None,
 ) -> tuple[StandardMerkleTree, list[Validator]]:
-    """Generates validators tree."""
+    """
+    Generates validators tree.
+    `encoded_leaves` maps validator public key and signature to the already encoded leaf.
+    """
     credentials = get_eth1_withdrawal_credentials(vault)
+    validators = _get_validators(deposit_data)
+    encoded_leaves = encoded_leaves or {}
+
     leaves: list[tuple[bytes, int]] = []
+    new_validators: list[Validator] = []
+    for validator in validators:
+        leaf = encoded_leaves.get(_get_leaf_key(validator))
+        if leaf is None:
+            new_validators.append(validator)
+        else:
+            leaves.append((leaf, validator.deposit_data_index))
+
+    if len(new_validators) < VALIDATORS_TREE_POOL_THRESHOLD:
+        leaves.extend(_encode_leaf(credentials, validator) for validator in new_validators)
+    else:
+        # encoding leaves is CPU bound, split it between the worker processes
+        processes = pool_size or cpu_count()
+        with Pool(processes=processes) as pool:
+            leaves.extend(
+                pool.starmap(
+                    _encode_leaf,
+                    [(credentials, validator) for validator in new_validators],
+                    chunksize=max(1, len(new_validators) // (processes * 4)),
+                )
+            )
+
+    if new_validators:
+        leaves.sort(key=lambda leaf: leaf[1])
+
+    tree = StandardMerkleTree.of(leaves, ['bytes', 'uint256'])
+    return tree, validators
+
+
+def _get_validators(deposit_data: list[dict]) -> list[Validator]:
     validators: list[Validator] = []
     for i, data in enumerate(deposit_data):
         validator = Validator(
@@ -217,31 +459,159 @@ def generate_validators_tree(
             public_key=add_0x_prefix(data['pubkey']),
             signature=add_0x_prefix(data['signature']),
         )
-        leaves.append((encode_tx_validator(credentials, validator), i))
         validators.append(validator)
+    return validators
 
-    tree = StandardMerkleTree.of(leaves, ['bytes', 'uint256'])
-    return tree, validators
+
+def _get_leaf_key(validator: Validator) -> str:
+    return (validator.public_key[2:] + validator.signature[2:]).lower()
+
+
+def _read_validators_tree_cache(cache_file: Path, vault: HexAddress) -> dict | None:
+    if not cache_file.is_file():
+        return None
+
+    try:
+        with open(cache_file, 'rb') as f:
+            cache = orjson.loads(f.read())
+    except (OSError, ValueError) as e:
+        logger.warning('Failed to read validators tree cache %s: %s', cache_file, format_error(e))
+        return None
+
+    if not isinstance(cache, dict) or cache.get('vault') != vault.lower():
+        return None
+    return cache
+
+
+def _load_validators_tree_cache(cache_file: Path, cache: dict) -> StandardMerkleTree | None:
+    try:
+        tree = StandardMerkleTree.load(
+            StandardMerkleTreeData(
+                tree=cache['tree'],
+                values=[
+                    LeafValue(value=(bytes.fromhex(leaf[2:]), i), tree_index=tree_index)
+                    for i, (leaf, tree_index) in enumerate(cache['values'])
+                ],
+                leaf_encoding=cache['leaf_encoding'],
+            )
+        )
+        # hashing the cached nodes is cheap compared to encoding the leaves
+        tree.validate()
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning('Failed to load validators tree cache %s: %s', cache_file, format_error(e))
+        return None
+    return tree
+
+
+def _get_cached_leaves(tree: StandardMerkleTree) -> dict[str, bytes]:
+    """Maps validator public key and signature to the cached leaf."""
+    # leaf is encoded as public key (48 bytes) + signature (96 bytes) + deposit root
+    return {value.value[0][:144].hex(): value.value[0] for value in tree.values}
+
+
+def _save_validators_tree_cache(
+    cache_file: Path, vault: HexAddress, deposit_data_hash: str, tree: StandardMerkleTree
+) -> None:
+    cache = {
+        'vault': vault.lower(),
+        'deposit_data_hash': deposit_data_hash,
+        'tree': [Web3.to_hex(node) for node in tree.tree],
+        'values': [[Web3.to_hex(v.value[0]), v.tree_index] for v in tree.values],
+        'leaf_encoding': tree.leaf_encoding,
+    }
+    # write to the temporary file first so that the cache is never left half-written
+    tmp_file = cache_file.with_name(f'{cache_file.name}.tmp')
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(cache))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning('Failed to save validators tree cache %s: %s', cache_file, format_error(e))
+
+
+def _encode_leaf(credentials: bytes, validator: Validator) -> tuple[bytes, int]:
+    return encode_tx_validator(credentials, validator), validator.deposit_data_index
 
 
 def _process_keystore_file(
     keystore_file: KeystoreFile, keystore_path: Path
 ) -> tuple[HexStr, BLSPrivkey]:
-    file_name = keystore_file.name
-    keystores_password = keystore_file.password
-    file_path = keystore_path / file_name
+    keystore = _load_keystore(keystore_file, keystore_path)
+    return _decrypt_keystores([(keystore_file, keystore)])[0]
 
+
+def _load_keystore(keystore_file: KeystoreFile, keystore_path: Path) -> Keystore:
     try:
-        keystore = ScryptKeystore.from_file(file_path)
+        return ScryptKeystore.from_file(keystore_path / keystore_file.name)
     except BaseException as e:
-        raise KeystoreException(f'Invalid keystore format in file "{file_name}"') from e
+        raise KeystoreException(f'Invalid keystore format in file "{keystore_file.name}"') from e
+
 
+def _decrypt_keystores(
+    keystores: list[tuple[KeystoreFile, Keystore]]
+) -> list[tuple[HexStr, BLSPrivkey]]:
+    """Decrypts the keystores sharing the password and KDF params with the same key."""
+    keystore_file, keystore = keystores[0]
     try:
-        private_key = BLSPrivkey(keystore.decrypt(keystores_password))
+        # pylint: disable-next=protected-access
+        password = keystore._process_password(keystore_file.password)
+        decryption_key = _derive_keystore_key(keystore, password)
     except BaseException as e:
-        raise KeystoreException(f'Invalid password for keystore "{file_name}"') from e
-    public_key = Web3.to_hex(bls.SkToPk(private_key))
-    return public_key, private_key
+        raise KeystoreException(f'Invalid password for keystore "{keystore_file.name}"') from e
+
+    results: list[tuple[HexStr, BLSPrivkey]] = []
+    for keystore_file, keystore in keystores:
+        try:
+            private_key = BLSPrivkey(_decrypt_keystore(keystore, decryption_key))
+        except BaseException as e:
+            raise KeystoreException(f'Invalid password for keystore "{keystore_file.name}"') from e
+        public_key = add_0x_prefix(HexStr(bls.SkToPk(private_key).hex()))
+        results.append((public_key, private_key))
+    return results
+
+
+def _get_keystore_hash(keystore_file: KeystoreFile, keystore_path: Path) -> str:
+    try:
+        with open(keystore_path / keystore_file.name, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        # the error is raised when the keystore is decrypted
+        return ''
+
+
+def _get_decryption_key_id(keystore: Keystore, password: str) -> tuple:
+    # pylint: disable-next=protected-access
+    password_bytes = keystore._process_password(password)
+    kdf_params = keystore.crypto.kdf.params
+    return keystore.crypto.kdf.function, password_bytes, tuple(sorted(kdf_params.items()))
+
+
+def _decrypt_keystore(keystore: Keystore, decryption_key: bytes) -> bytes:
+    """Same as `Keystore.decrypt`, but with the already derived decryption key."""
+    checksum = SHA256(decryption_key[16:32] + keystore.crypto.cipher.message)
+    if checksum != keystore.crypto.checksum.message:
+        raise ValueError('Checksum message error')
+
+    cipher = AES_128_CTR(key=decryption_key[:16], **keystore.crypto.cipher.params)
+    return cipher.decrypt(keystore.crypto.cipher.message)
+
+
+def _derive_keystore_key(keystore: Keystore, password: bytes) -> bytes:
+    kdf_params = keystore.crypto.kdf.params
+    if keystore.crypto.kdf.function != 'scrypt':
+        return keystore.kdf(password=password, **kdf_params)
+
+    # OpenSSL implementation of scrypt is faster and releases the GIL
+    n, r, p = kdf_params['n'], kdf_params['r'], kdf_params['p']
+    return hashlib.scrypt(
+        password,
+        salt=kdf_params['salt'],
+        n=n,
+        r=r,
+        p=p,
+        dklen=kdf_params['dklen'],
+        maxmem=128 * r * (n + p + 2),
+    )
 
 
 def _load_keystores_password(password_path: Path) -> str: